@@ -30,6 +30,9 @@ def sync_events_handler(request):
     try:
         result = sync_events()
 
+        if result.get('skipped'):
+            return (f"No changes since {result['timestamp']}; {result['url']} is current", 200)
+
         return (
             f"Successfully synced {result['eventCount']} events to {result['url']}",
             200
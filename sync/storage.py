@@ -8,18 +8,52 @@ Supported backends:
 - Local filesystem (custom server)
 """
 
+import io
 import os
+import gzip
 import json
 import logging
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
-from datetime import datetime
+from typing import BinaryIO, Dict, Any, Optional
+from datetime import datetime, timezone
 
 from config import SyncConfig, DeploymentType
 
+# orjson is optional; fall back to the stdlib json module when not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
+def _json_default(obj: Any) -> str:
+    """Serialize values stdlib json can't handle, matching orjson's datetimes."""
+    if isinstance(obj, datetime):
+        if obj.tzinfo is None:
+            obj = obj.replace(tzinfo=timezone.utc)
+        return obj.isoformat().replace('+00:00', 'Z')
+
+    return str(obj)
+
+
+def _write_events(f: BinaryIO, events_data: Dict[str, Any]) -> None:
+    """Serialize events data as UTF-8 JSON into a binary file object."""
+    # Compact output: events.json is machine-read, so indentation is just
+    # extra bytes to format and download
+    if orjson is not None:
+        f.write(orjson.dumps(events_data, option=orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z))
+        return
+
+    # json.dump issues one write() per token, so buffer them in a text
+    # wrapper and detach afterwards to leave the caller's handle open
+    text = io.TextIOWrapper(f, encoding='utf-8', write_through=False)
+    json.dump(events_data, text, separators=(',', ':'), default=_json_default)
+    text.flush()
+    text.detach()
+
+
 class StorageBackend(ABC):
     """Abstract base class for storage backends."""
 
@@ -43,6 +77,16 @@ class StorageBackend(ABC):
         """
         pass
 
+    @abstractmethod
+    def load_sync_state(self, org_id: str) -> Dict[str, Any]:
+        """Load the state recorded by the last successful sync (empty if none)."""
+        pass
+
+    @abstractmethod
+    def save_sync_state(self, org_id: str, state: Dict[str, Any]) -> None:
+        """Record the state of a successful sync."""
+        pass
+
 
 class GoogleCloudStorage(StorageBackend):
     """Google Cloud Storage + Firestore backend."""
@@ -56,6 +100,7 @@ class GoogleCloudStorage(StorageBackend):
         from google.cloud import storage, firestore
         self._storage_client = storage.Client(project=self.project_id)
         self._firestore_client = firestore.Client(project=self.project_id)
+        self._bucket = self._storage_client.bucket(self.bucket_name)
 
     def load_config(self, org_id: str) -> Dict[str, Any]:
         """Load config from Firestore."""
@@ -71,21 +116,50 @@ class GoogleCloudStorage(StorageBackend):
         self._firestore_client.collection(self.firestore_collection).document(org_id).set(config)
 
     def save_events(self, org_id: str, events_data: Dict[str, Any]) -> str:
-        """Save events to Cloud Storage."""
-        bucket = self._storage_client.bucket(self.bucket_name)
-        blob = bucket.blob(f'{org_id}/events.json')
+        """
+        Save events to Cloud Storage.
 
-        json_str = json.dumps(events_data, indent=2, default=str)
-        blob.upload_from_string(json_str, content_type='application/json')
+        Public read access comes from the bucket's IAM policy (allUsers as
+        Storage Object Viewer), so no per-object ACL is set here.
+        """
+        blob = self._bucket.blob(f'{org_id}/events.json')
 
-        # Make publicly readable
-        blob.make_public()
+        # Store gzipped; GCS serves it with Content-Encoding: gzip and
+        # decompresses on the fly for clients that don't accept gzip
+        blob.content_encoding = 'gzip'
+
+        # Let browsers and edge caches reuse the file between page views
+        blob.cache_control = 'public, max-age=60'
+
+        # Compress in memory and send it as one multipart upload; a
+        # streaming blob.open() writer would use a resumable upload, which
+        # costs an extra request. mtime=0 keeps the gzip header identical
+        # for identical content.
+        buffer = io.BytesIO()
+        with gzip.GzipFile(fileobj=buffer, mode='wb', mtime=0) as gz:
+            _write_events(gz, events_data)
+
+        blob.upload_from_string(buffer.getvalue(), content_type='application/json')
 
         url = f'https://storage.googleapis.com/{self.bucket_name}/{org_id}/events.json'
         logger.info(f"Saved events to {url}")
 
         return url
 
+    def _sync_state_doc(self, org_id: str):
+        # Kept in a subcollection so save_config() doesn't overwrite it
+        return (self._firestore_client.collection(self.firestore_collection)
+                .document(org_id).collection('sync').document('state'))
+
+    def load_sync_state(self, org_id: str) -> Dict[str, Any]:
+        """Load sync state from Firestore."""
+        doc = self._sync_state_doc(org_id).get()
+        return doc.to_dict() if doc.exists else {}
+
+    def save_sync_state(self, org_id: str, state: Dict[str, Any]) -> None:
+        """Save sync state to Firestore."""
+        self._sync_state_doc(org_id).set(state)
+
     def _default_config(self) -> Dict[str, Any]:
         return {
             'autoTagRules': [],
@@ -136,8 +210,8 @@ class LocalFileStorage(StorageBackend):
 
         file_path = os.path.join(org_dir, 'events.json')
 
-        with open(file_path, 'w') as f:
-            json.dump(events_data, f, indent=2, default=str)
+        with open(file_path, 'wb', buffering=1 << 20) as f:
+            _write_events(f, events_data)
 
         logger.info(f"Saved events to {file_path}")
 
@@ -147,6 +221,33 @@ class LocalFileStorage(StorageBackend):
         else:
             return file_path
 
+    def _sync_state_path(self, org_id: str) -> str:
+        # Next to config.json, not under data_directory, which is served publicly
+        return os.path.join(os.path.dirname(self.config_file), f'sync_state_{org_id}.json')
+
+    def load_sync_state(self, org_id: str) -> Dict[str, Any]:
+        """Load sync state from JSON file."""
+        state_path = self._sync_state_path(org_id)
+
+        if os.path.exists(state_path):
+            with open(state_path, 'r') as f:
+                return json.load(f)
+
+        return {}
+
+    def save_sync_state(self, org_id: str, state: Dict[str, Any]) -> None:
+        """Save sync state to JSON file."""
+        state_path = self._sync_state_path(org_id)
+        os.makedirs(os.path.dirname(state_path) or '.', exist_ok=True)
+
+        # Write then rename, so an interrupted write never leaves a
+        # truncated state file behind
+        tmp_path = f'{state_path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f, indent=2)
+
+        os.replace(tmp_path, state_path)
+
     def _default_config(self) -> Dict[str, Any]:
         return {
             'auto_tag_rules': [],
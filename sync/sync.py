@@ -14,12 +14,29 @@ Usage:
     See main.py for the Cloud Function wrapper
 """
 
+import asyncio
+import hashlib
+import json
 import logging
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 
 import requests
 
+# aiohttp is optional; without it pages are fetched one at a time
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# pyahocorasick is optional; without it name-contains rules are checked one by one
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 from config import load_config, SyncConfig
 from storage import create_storage_backend, StorageBackend
 
@@ -38,6 +55,13 @@ logger = logging.getLogger(__name__)
 class WildApricotClient:
     """Client for Wild Apricot API."""
 
+    # Page size and connection limit for concurrent page fetches
+    PAGE_SIZE = 100
+    MAX_CONCURRENT_REQUESTS = 10
+
+    # Hard cap on $top/$skip pages before falling back to a serial fetch
+    MAX_PAGES = 100
+
     def __init__(self, account_id: str, api_key: str):
         self.account_id = account_id
         self.api_key = api_key
@@ -45,6 +69,10 @@ class WildApricotClient:
         self.token = None
         self.token_expires = None
 
+        # Reuse one connection pool for the token and page requests
+        self._session = requests.Session()
+        self._session.headers.update({'Accept': 'application/json'})
+
     def _get_token(self) -> str:
         """Get OAuth token, refreshing if needed."""
         if self.token and self.token_expires and datetime.now() < self.token_expires:
@@ -53,7 +81,7 @@ class WildApricotClient:
         logger.info("Refreshing WA API token")
 
         auth_url = "https://oauth.wildapricot.org/auth/token"
-        response = requests.post(
+        response = self._session.post(
             auth_url,
             data={
                 'grant_type': 'client_credentials',
@@ -69,132 +97,372 @@ class WildApricotClient:
 
         return self.token
 
-    def get_events(self, include_past_days: int = 0) -> List[Dict[str, Any]]:
+    def _events_query(self, include_past_days: int,
+                      updated_since: Optional[datetime] = None) -> Tuple[str, Dict[str, str]]:
+        """Build the events URL and query parameters for a date range."""
+        start_date = datetime.now() - timedelta(days=include_past_days)
+
+        url = f"{self.base_url}/accounts/{self.account_id}/events"
+        params = {
+            '$filter': f"StartDate ge {start_date.strftime('%Y-%m-%d')}",
+            '$sort': 'StartDate asc'
+        }
+
+        if updated_since is not None:
+            params['$filter'] += f" and LastUpdated gt {updated_since.strftime('%Y-%m-%dT%H:%M:%SZ')}"
+
+        return url, params
+
+    def count_events(self, include_past_days: int = 0,
+                     updated_since: Optional[datetime] = None) -> Optional[int]:
         """
-        Fetch events from Wild Apricot.
+        Count events in the sync window without fetching them.
 
         Args:
             include_past_days: Number of past days to include
+            updated_since: Only count events changed after this UTC time
 
         Returns:
-            List of event dictionaries
+            Number of matching events, or None if the API returned no count
         """
         token = self._get_token()
+        url, params = self._events_query(include_past_days, updated_since)
+        params['$count'] = 'true'
 
-        # Calculate date range
-        start_date = datetime.now() - timedelta(days=include_past_days)
+        response = self._session.get(url, headers={'Authorization': f'Bearer {token}'}, params=params)
+        response.raise_for_status()
 
-        url = f"{self.base_url}/accounts/{self.account_id}/events"
-        params = {
-            '$filter': f"StartDate ge {start_date.strftime('%Y-%m-%d')}",
-            '$sort': 'StartDate asc'
-        }
+        data = response.json()
+        return data.get('Count') if isinstance(data, dict) else None
 
-        headers = {
-            'Authorization': f'Bearer {token}',
-            'Accept': 'application/json'
-        }
+    @staticmethod
+    def _parse_page(data: Any) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Split a page response into its events and the next page URL."""
+        # Handle different response formats
+        if isinstance(data, dict):
+            return data.get('Events', []), data.get('ResultNextPageUrl')
+
+        return data, None
+
+    def iter_events(self, include_past_days: int = 0) -> Iterator[Dict[str, Any]]:
+        """
+        Yield events from Wild Apricot, one page request at a time.
 
-        logger.info(f"Fetching events from WA API (since {start_date.date()})")
+        Each page is transformed by the caller before the next is requested,
+        so only one page of raw events is held at a time.
+
+        Args:
+            include_past_days: Number of past days to include
+
+        Yields:
+            Event dictionaries
+        """
+        token = self._get_token()
+        url, params = self._events_query(include_past_days)
+        logger.info(f"Fetching events from WA API ({params['$filter']})")
+
+        headers = {'Authorization': f'Bearer {token}'}
 
-        all_events = []
         page_url = url
 
         while page_url:
-            response = requests.get(page_url, headers=headers, params=params if page_url == url else None)
+            response = self._session.get(page_url, headers=headers, params=params if page_url == url else None)
             response.raise_for_status()
 
-            data = response.json()
+            events, page_url = self._parse_page(response.json())
+            yield from events
 
-            # Handle different response formats
-            if isinstance(data, dict):
-                events = data.get('Events', [])
-                all_events.extend(events)
+    def get_events(self, include_past_days: int = 0) -> List[Dict[str, Any]]:
+        """
+        Fetch events from Wild Apricot.
+
+        Args:
+            include_past_days: Number of past days to include
+
+        Returns:
+            List of event dictionaries
+        """
+        all_events = list(self.iter_events(include_past_days))
+
+        logger.info(f"Fetched {len(all_events)} events from WA")
+        return all_events
+
+    async def get_events_async(self, include_past_days: int = 0,
+                               expected_count: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Fetch events from Wild Apricot, requesting pages concurrently.
+
+        The first $top/$skip page comes over the pooled session that
+        fetched the token. Only when it comes back full are further pages
+        requested, several at a time, until one returns short. Falls back
+        to walking ResultNextPageUrl if the API pages that way instead.
+
+        When the caller already knows roughly how many events to expect,
+        the first batch after page one covers all of them at once.
+
+        Args:
+            include_past_days: Number of past days to include
+            expected_count: Event count from a recent $count query, if any
+
+        Returns:
+            List of event dictionaries
+        """
+        token = self._get_token()
+        url, params = self._events_query(include_past_days)
+        logger.info(f"Fetching events from WA API ({params['$filter']})")
+
+        headers = {'Authorization': f'Bearer {token}'}
+        page_params = {**params, '$top': str(self.PAGE_SIZE)}
+
+        def get_page(page_url: str, query: Optional[Dict[str, str]]) -> Any:
+            response = self._session.get(page_url, headers=headers, params=query)
+            response.raise_for_status()
+            return response.json()
+
+        all_events, page_url = self._parse_page(
+            await asyncio.to_thread(get_page, url, {**page_params, '$skip': '0'}))
 
-                # Check for pagination
-                page_url = data.get('ResultNextPageUrl')
-            else:
-                all_events.extend(data)
-                page_url = None
+        if page_url:
+            # The API ignored $top/$skip and paged its own way
+            while page_url:
+                events, page_url = self._parse_page(await asyncio.to_thread(get_page, page_url, None))
+                all_events.extend(events)
+        elif len(all_events) == self.PAGE_SIZE:
+            batch_size = 1
+            max_pages = self.MAX_PAGES
+            if expected_count is not None:
+                batch_size = min(max(expected_count // self.PAGE_SIZE, 1), self.MAX_CONCURRENT_REQUESTS)
+                max_pages = min(expected_count // self.PAGE_SIZE + 2, self.MAX_PAGES)
+
+            remaining = await self._fetch_pages(url, page_params, headers, all_events, batch_size, max_pages)
+            if remaining is None:
+                return await asyncio.to_thread(self.get_events, include_past_days)
+
+            all_events.extend(remaining)
+
+        return self._finish_fetch(all_events)
+
+    def _finish_fetch(self, all_events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """De-duplicate concurrently fetched events and log the total."""
+        # Pages are read at slightly different times, so an event moved by
+        # a concurrent edit can show up on two of them
+        seen_ids = set()
+        unique_events = []
+        for event in all_events:
+            event_id = event.get('Id')
+            if event_id is not None:
+                if event_id in seen_ids:
+                    continue
+                seen_ids.add(event_id)
+            unique_events.append(event)
+        all_events = unique_events
 
         logger.info(f"Fetched {len(all_events)} events from WA")
         return all_events
 
+    async def _fetch_pages(self, url: str, page_params: Dict[str, str], headers: Dict[str, str],
+                           first_page: List[Dict[str, Any]], batch_size: int,
+                           max_pages: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Fetch the pages after `first_page`, a batch at a time, until one is short.
+
+        Batches start at `batch_size` pages and double up to
+        MAX_CONCURRENT_REQUESTS, so small feeds don't request a run of
+        empty pages.
+
+        Returns None if paging looks broken: a batch adds no new event Ids
+        (the API is ignoring $skip), or more than `max_pages` pages in total
+        would be needed.
+        """
+        events = []
+        seen_ids = {event.get('Id') for event in first_page}
+        skip = self.PAGE_SIZE
+        pages_fetched = 1
+
+        connector = aiohttp.TCPConnector(limit=self.MAX_CONCURRENT_REQUESTS)
+        async with aiohttp.ClientSession(connector=connector, headers={**headers, 'Accept': 'application/json'},
+                                         raise_for_status=True) as session:
+
+            async def fetch(page_skip: int) -> List[Dict[str, Any]]:
+                async with session.get(url, params={**page_params, '$skip': str(page_skip)}) as response:
+                    return self._parse_page(await response.json(content_type=None))[0]
+
+            while True:
+                batch_size = min(batch_size, max_pages - pages_fetched)
+                if batch_size <= 0:
+                    logger.warning(f"No short page after {pages_fetched} pages; falling back to serial fetch")
+                    return None
+
+                pages = await asyncio.gather(*(
+                    fetch(skip + i * self.PAGE_SIZE) for i in range(batch_size)
+                ))
+                skip += batch_size * self.PAGE_SIZE
+                pages_fetched += batch_size
+                batch_size = min(batch_size * 2, self.MAX_CONCURRENT_REQUESTS)
+
+                new_ids = False
+                for page in pages:
+                    for event in page:
+                        event_id = event.get('Id')
+                        if event_id not in seen_ids:
+                            seen_ids.add(event_id)
+                            new_ids = True
+
+                    events.extend(page)
+                    if len(page) < self.PAGE_SIZE:
+                        return events
+
+                if not new_ids:
+                    logger.warning("Paged requests returned no new events; falling back to serial fetch")
+                    return None
+
 
 # =============================================================================
 # EVENT TRANSFORMATION
 # =============================================================================
+#
+# Transformation stays in plain Python on purpose. Events are dicts of mixed
+# strings, None and nested dicts, which Numba cannot type, and the only
+# numeric work (availability, weekend) is a few comparisons per event. Per-run
+# setup is hoisted into sync_events instead, so the per-event path is cheap.
+
+@dataclass
+class CompiledRules:
+    """Auto-tag rules pre-processed for fast per-event matching."""
+    # Lowercased pattern -> tags, one mapping per rule type
+    prefixes: Dict[str, List[str]] = field(default_factory=dict)
+    contains: Dict[str, List[str]] = field(default_factory=dict)
+    suffixes: Dict[str, List[str]] = field(default_factory=dict)
+
+    # Distinct prefix/suffix lengths, used to slice the event name
+    prefix_lengths: List[int] = field(default_factory=list)
+    suffix_lengths: List[int] = field(default_factory=list)
 
-def apply_auto_tags(event: Dict[str, Any], rules: List[Dict[str, Any]]) -> List[str]:
+    # Aho-Corasick automaton over `contains`, when pyahocorasick is installed
+    automaton: Any = None
+
+
+def _compile_rules(rules: List[Dict[str, Any]]) -> CompiledRules:
     """
-    Apply auto-tagging rules to an event.
+    Pre-process auto-tag rules once per sync.
 
     Args:
-        event: Event dictionary from WA API
         rules: List of auto-tag rules from config
 
     Returns:
-        List of auto-generated tags
+        Valid rules indexed by rule type and lowercased pattern
     """
-    auto_tags = []
-    event_name = event.get('Name', '').lower()
+    compiled = CompiledRules()
+    by_type = {
+        'name-prefix': compiled.prefixes,
+        'name-contains': compiled.contains,
+        'name-suffix': compiled.suffixes
+    }
 
     for rule in rules:
-        rule_type = rule.get('type')
         pattern = rule.get('pattern', '').lower()
         tag = rule.get('tag')
 
-        if not pattern or not tag:
+        if not pattern or not tag or rule.get('type') not in by_type:
             continue
 
-        matched = False
+        by_type[rule['type']].setdefault(pattern, []).append(tag)
+
+    compiled.prefix_lengths = sorted({len(p) for p in compiled.prefixes})
+    compiled.suffix_lengths = sorted({len(p) for p in compiled.suffixes})
+
+    # Match every name-contains pattern in a single pass over the name.
+    # Each pattern carries its rule order so matches can be put back in it.
+    if ahocorasick is not None and compiled.contains:
+        compiled.automaton = ahocorasick.Automaton()
+        for index, (pattern, tags) in enumerate(compiled.contains.items()):
+            compiled.automaton.add_word(pattern, (index, tags))
+        compiled.automaton.make_automaton()
+
+    return compiled
+
+
+def apply_auto_tags(event: Dict[str, Any], compiled_rules: CompiledRules) -> List[str]:
+    """
+    Apply auto-tagging rules to an event.
+
+    Args:
+        event: Event dictionary from WA API
+        compiled_rules: Rules pre-processed by _compile_rules
+
+    Returns:
+        List of auto-generated tags (may contain duplicates)
+    """
+    event_name = event.get('Name', '').lower()
+    auto_tags = []
 
-        if rule_type == 'name-prefix':
-            matched = event_name.startswith(pattern)
-        elif rule_type == 'name-contains':
-            matched = pattern in event_name
-        elif rule_type == 'name-suffix':
-            matched = event_name.endswith(pattern)
+    for length in compiled_rules.prefix_lengths:
+        auto_tags.extend(compiled_rules.prefixes.get(event_name[:length], ()))
 
-        if matched:
-            auto_tags.append(tag)
+    if compiled_rules.automaton is not None:
+        # Automaton matches come in name order; sort them into rule order so
+        # the output doesn't depend on whether pyahocorasick is installed
+        matches = {index: tags for _, (index, tags) in compiled_rules.automaton.iter(event_name)}
+        for index in sorted(matches):
+            auto_tags.extend(matches[index])
+    else:
+        for pattern, tags in compiled_rules.contains.items():
+            if pattern in event_name:
+                auto_tags.extend(tags)
+
+    for length in compiled_rules.suffix_lengths:
+        auto_tags.extend(compiled_rules.suffixes.get(event_name[-length:], ()))
 
     return auto_tags
 
 
-def derive_time_of_day(start_date_str: str, config: Dict[str, Any]) -> Optional[str]:
-    """Derive time-of-day tag from event start time."""
-    try:
-        # Parse ISO datetime
-        start_dt = datetime.fromisoformat(start_date_str.replace('Z', '+00:00'))
-        hour = start_dt.hour
+def _time_of_day_thresholds(config: Dict[str, Any]) -> Tuple[int, int]:
+    """Read the morning/afternoon cut-off hours from org config."""
+    time_config = config.get('derived_fields', config.get('derivedFields', {})) or {}
+    time_config = time_config.get('time_of_day', time_config.get('timeOfDay', {})) or {}
 
-        time_config = config.get('derived_fields', config.get('derivedFields', {}))
-        time_config = time_config.get('time_of_day', time_config.get('timeOfDay', {}))
+    morning_before = _threshold_hour(time_config.get('morning'), 12)
+    afternoon_before = _threshold_hour(time_config.get('afternoon'), 17)
 
-        morning_before = time_config.get('morning', {}).get('before', 12)
-        afternoon_before = time_config.get('afternoon', {}).get('before', 17)
+    return morning_before, afternoon_before
 
-        if hour < morning_before:
-            return 'time:morning'
-        elif hour < afternoon_before:
-            return 'time:afternoon'
-        else:
-            return 'time:evening'
+
+def _threshold_hour(period: Any, default: int) -> int:
+    """Read a period's 'before' hour as an int, or the default if invalid."""
+    try:
+        return int((period or {}).get('before', default))
+    except (ValueError, AttributeError, TypeError):
+        return default
+
+
+def _parse_iso(date_str: str) -> Optional[datetime]:
+    """Parse an ISO 8601 datetime from the WA API, or None if invalid."""
+    try:
+        return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
     except (ValueError, AttributeError, TypeError):
         return None
 
 
-def derive_availability(event: Dict[str, Any]) -> str:
-    """Derive availability tag from registration data."""
-    limit = event.get('RegistrationsLimit')
-    confirmed = event.get('ConfirmedRegistrationsCount', 0)
+def derive_time_of_day(start_dt: Optional[datetime], morning_before: int, afternoon_before: int) -> Optional[str]:
+    """Derive time-of-day tag from event start time."""
+    if start_dt is None:
+        return None
+
+    hour = start_dt.hour
+
+    if hour < morning_before:
+        return 'time:morning'
+    elif hour < afternoon_before:
+        return 'time:afternoon'
+    else:
+        return 'time:evening'
 
+
+def derive_availability(limit: Optional[int], spots: Optional[int]) -> str:
+    """Derive availability tag from the registration limit and open spots."""
     if limit is None or limit == 0:
         return 'availability:open'
 
-    spots = limit - confirmed
-
     if spots <= 0:
         return 'availability:full'
     elif spots <= 5:
@@ -203,82 +471,85 @@ def derive_availability(event: Dict[str, Any]) -> str:
         return 'availability:open'
 
 
-def derive_weekend(start_date_str: str) -> bool:
+def derive_weekend(start_dt: Optional[datetime]) -> bool:
     """Check if event is on a weekend."""
-    try:
-        start_dt = datetime.fromisoformat(start_date_str.replace('Z', '+00:00'))
-        return start_dt.weekday() >= 5  # Saturday = 5, Sunday = 6
-    except (ValueError, AttributeError, TypeError):
-        return False
+    return start_dt is not None and start_dt.weekday() >= 5  # Saturday = 5, Sunday = 6
 
 
-def transform_event(event: Dict[str, Any], org_config: Dict[str, Any]) -> Dict[str, Any]:
+def transform_event(event: Dict[str, Any], compiled_rules: CompiledRules,
+                    morning_before: int, afternoon_before: int) -> Dict[str, Any]:
     """
     Transform WA event to ClubCalendar format.
 
     Args:
         event: Raw event from WA API
-        org_config: Organization configuration
+        compiled_rules: Auto-tag rules pre-processed by _compile_rules
+        morning_before: Hour before which an event counts as morning
+        afternoon_before: Hour before which an event counts as afternoon
 
     Returns:
         Transformed event dictionary
     """
+    get = event.get
+
     # Get existing tags from WA
-    wa_tags = event.get('Tags', [])
+    wa_tags = get('Tags', [])
     if isinstance(wa_tags, str):
         wa_tags = [t.strip() for t in wa_tags.split(',') if t.strip()]
     elif wa_tags is None:
         wa_tags = []
 
-    # Get auto-tag rules (support both naming conventions)
-    auto_tag_rules = org_config.get('auto_tag_rules', org_config.get('autoTagRules', []))
-
     # Apply auto-tagging rules
-    auto_tags = apply_auto_tags(event, auto_tag_rules)
+    auto_tags = apply_auto_tags(event, compiled_rules)
 
     # Derive additional tags
-    start_date = event.get('StartDate', '')
+    start_date = get('StartDate', '')
+    start_dt = _parse_iso(start_date)
 
-    time_tag = derive_time_of_day(start_date, org_config)
+    time_tag = derive_time_of_day(start_dt, morning_before, afternoon_before)
     if time_tag:
         auto_tags.append(time_tag)
 
-    avail_tag = derive_availability(event)
+    # Calculate spots available
+    limit = get('RegistrationsLimit')
+    confirmed = get('ConfirmedRegistrationsCount', 0)
+    spots = None if limit is None else max(0, limit - confirmed)
+
+    avail_tag = derive_availability(limit, spots)
     auto_tags.append(avail_tag)
 
-    if derive_weekend(start_date):
+    if derive_weekend(start_dt):
         auto_tags.append('day:weekend')
 
-    # Combine all tags (deduplicated)
-    all_tags = list(set(wa_tags + auto_tags))
-
-    # Calculate spots available
-    limit = event.get('RegistrationsLimit')
-    confirmed = event.get('ConfirmedRegistrationsCount', 0)
-    spots = None if limit is None else max(0, limit - confirmed)
+    # Combine all tags (deduplicated, keeping first-seen order so the
+    # output is byte-stable between syncs)
+    all_tags = list(dict.fromkeys((*wa_tags, *auto_tags)))
 
     # Get event URL
-    event_id = event.get('Id')
-    event_url = event.get('Url', '')
+    event_id = get('Id')
+    event_url = get('Url', '')
     if not event_url and event_id:
         # Construct URL if not provided
         event_url = f"https://sbnewcomers.org/event-{event_id}"
 
+    details = get('Details')
+    description = details.get('DescriptionHtml', '') if isinstance(details, dict) else ''
+
     # Build transformed event
     return {
         'id': event_id,
-        'name': event.get('Name', ''),
+        'name': get('Name', ''),
         'start': start_date,
-        'end': event.get('EndDate', ''),
-        'location': event.get('Location', ''),
-        'description': event.get('Details', {}).get('DescriptionHtml', '') if isinstance(event.get('Details'), dict) else '',
+        'end': get('EndDate', ''),
+        'location': get('Location', ''),
+        'description': description,
         'url': event_url,
-        'registrationUrl': event.get('RegistrationUrl', ''),
+        'registrationUrl': get('RegistrationUrl', ''),
         'tags': all_tags,
         'spotsAvailable': spots,
         'isFull': spots == 0 if spots is not None else False,
-        'registrationEnabled': event.get('RegistrationEnabled', True),
-        'accessLevel': event.get('AccessLevel', 'Public')
+        'registrationEnabled': get('RegistrationEnabled', True),
+        'accessLevel': get('AccessLevel', 'Public')
     }
 
 
@@ -286,6 +557,57 @@ def transform_event(event: Dict[str, Any], org_config: Dict[str, Any]) -> Dict[s
 # MAIN SYNC FUNCTION
 # =============================================================================
 
+# Matches cancelled events by name without building an uppercased copy
+_CANCELLED_RE = re.compile('cancelled', re.IGNORECASE)
+
+# Rewrite events.json at least this often, even if nothing seems changed.
+# Kept short because spotsAvailable/isFull come from registration counts,
+# and WA is not known to bump an event's LastUpdated on each registration.
+FULL_SYNC_INTERVAL = timedelta(hours=1)
+
+# Look this far before the last sync for updated events, to allow for
+# clock differences between this host and Wild Apricot
+CLOCK_SKEW_MARGIN = timedelta(minutes=5)
+
+
+def _config_hash(org_config: Dict[str, Any]) -> str:
+    """Fingerprint the org config so config edits force a full sync."""
+    return hashlib.sha256(json.dumps(org_config, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def _events_unchanged(wa_client: WildApricotClient, state: Dict[str, Any],
+                      config_hash: str, include_past_days: int) -> Tuple[bool, Optional[int]]:
+    """
+    Check whether the last saved events.json is still current.
+
+    Unchanged only if the org config and sync window are the same as last
+    time, the number of events in the window still matches (which catches
+    deletions), and no event in the window was updated since.
+
+    Returns:
+        (unchanged, current event count in the window if it was queried)
+    """
+    last_sync = _parse_iso(state.get('lastSync'))
+
+    if (last_sync is None
+            or state.get('configHash') != config_hash
+            or state.get('includePastDays') != include_past_days
+            or datetime.now(timezone.utc) - last_sync >= FULL_SYNC_INTERVAL):
+        return False, None
+
+    total = None
+    try:
+        total = wa_client.count_events(include_past_days)
+        if total is None or total != state.get('rawEventCount'):
+            return False, total
+
+        updated = wa_client.count_events(include_past_days, updated_since=last_sync - CLOCK_SKEW_MARGIN)
+        return updated == 0, total
+    except requests.RequestException as e:
+        logger.warning(f"Change check failed, running full sync: {e}")
+        return False, total
+
+
 def sync_events(config: Optional[SyncConfig] = None) -> Dict[str, Any]:
     """
     Main sync function.
@@ -311,23 +633,64 @@ def sync_events(config: Optional[SyncConfig] = None) -> Dict[str, Any]:
     org_config = storage.load_config(config.org_id)
     logger.info(f"Loaded config for org: {config.org_id}")
 
+    # Get auto-tag rules (support both naming conventions)
+    auto_tag_rules = org_config.get('auto_tag_rules', org_config.get('autoTagRules', []))
+    compiled_rules = _compile_rules(auto_tag_rules)
+    morning_before, afternoon_before = _time_of_day_thresholds(org_config)
+
     # Fetch events from Wild Apricot
     wa_client = WildApricotClient(
         config.wa_config.account_id,
         config.wa_config.api_key
     )
-    raw_events = wa_client.get_events(include_past_days=config.include_past_days)
+
+    # Optionally skip the fetch and upload when nothing has changed since
+    # the last sync. Off by default: registrations may not bump an event's
+    # LastUpdated, so availability could lag until the next full sync.
+    skip_unchanged = org_config.get('skip_unchanged_syncs', org_config.get('skipUnchangedSyncs', False))
+    sync_started = datetime.now(timezone.utc)
+    config_hash = _config_hash(org_config)
+
+    state = {}
+    if skip_unchanged:
+        try:
+            state = storage.load_sync_state(config.org_id)
+        except Exception as e:
+            logger.warning(f"Could not load sync state, running full sync: {e}")
+
+    unchanged, event_count = False, None
+    if state:
+        unchanged, event_count = _events_unchanged(wa_client, state, config_hash, config.include_past_days)
+
+    if unchanged:
+        logger.info(f"No event changes since {state['lastSync']}; skipping sync")
+        return {
+            'success': True,
+            'skipped': True,
+            'eventCount': state.get('eventCount'),
+            'url': state.get('url'),
+            'timestamp': state['lastSync']
+        }
+
+    if aiohttp is not None:
+        raw_events = asyncio.run(wa_client.get_events_async(include_past_days=config.include_past_days,
+                                                            expected_count=event_count))
+    else:
+        # Transform each page before requesting the next
+        raw_events = wa_client.iter_events(include_past_days=config.include_past_days)
 
     # Transform events
     transformed_events = []
+    raw_event_count = 0
     for event in raw_events:
+        raw_event_count += 1
+
         # Skip cancelled events
-        name = event.get('Name', '')
-        if 'CANCELLED' in name.upper():
+        if _CANCELLED_RE.search(event.get('Name') or ''):
             continue
 
         try:
-            transformed = transform_event(event, org_config)
+            transformed = transform_event(event, compiled_rules, morning_before, afternoon_before)
             transformed_events.append(transformed)
         except Exception as e:
             logger.warning(f"Failed to transform event {event.get('Id')}: {e}")
@@ -335,10 +698,11 @@ def sync_events(config: Optional[SyncConfig] = None) -> Dict[str, Any]:
 
     logger.info(f"Transformed {len(transformed_events)} events")
 
-    # Build output
+    # Build output (the storage backend serializes the timestamp as ...Z)
+    generated = datetime.now(timezone.utc)
     output = {
         '_warning': 'This file is auto-generated. Do not edit manually.',
-        '_generated': datetime.utcnow().isoformat() + 'Z',
+        '_generated': generated,
         '_orgId': config.org_id,
         'eventCount': len(transformed_events),
         'events': transformed_events
@@ -347,11 +711,26 @@ def sync_events(config: Optional[SyncConfig] = None) -> Dict[str, Any]:
     # Save to storage
     url = storage.save_events(config.org_id, output)
 
+    # events.json is already saved, so a failure here only costs the next
+    # run its chance to skip
+    if skip_unchanged:
+        try:
+            storage.save_sync_state(config.org_id, {
+                'lastSync': sync_started.isoformat().replace('+00:00', 'Z'),
+                'configHash': config_hash,
+                'includePastDays': config.include_past_days,
+                'rawEventCount': raw_event_count,
+                'eventCount': len(transformed_events),
+                'url': url
+            })
+        except Exception as e:
+            logger.warning(f"Could not save sync state: {e}")
+
     result = {
         'success': True,
         'eventCount': len(transformed_events),
         'url': url,
-        'timestamp': output['_generated']
+        'timestamp': generated.isoformat().replace('+00:00', 'Z')
     }
 
     logger.info(f"Sync complete: {len(transformed_events)} events saved to {url}")
@@ -368,7 +747,10 @@ if __name__ == '__main__':
 
     try:
         result = sync_events()
-        print(f"Success: Synced {result['eventCount']} events")
+        if result.get('skipped'):
+            print(f"No changes since {result['timestamp']}")
+        else:
+            print(f"Success: Synced {result['eventCount']} events")
         print(f"Output: {result['url']}")
         sys.exit(0)
     except Exception as e: